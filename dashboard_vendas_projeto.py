@@ -7,9 +7,15 @@ visualizações em abas, com filtros interativos.
 '''
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 from datetime import datetime, date
 
+try:
+    import polars as pl # Leitor de CSV multithread; opcional
+except ImportError:
+    pl = None
+
 # Configuração da Página
 st.set_page_config(page_title="Painel de Vendas", page_icon="💰", layout="wide")
 
@@ -18,39 +24,109 @@ st.set_page_config(page_title="Painel de Vendas", page_icon="💰", layout="wide
 def load_data(): # Remover base_path ou usar um default que indique o diretório atual
     try:
         # Usar caminhos relativos. Os CSVs devem estar na mesma pasta que este script.
-        produtos_df = pd.read_csv('produtos.csv')
-        clientes_df = pd.read_csv('clientes.csv')
-        vendedores_df = pd.read_csv('vendedores.csv')
-        vendas_df = pd.read_csv('vendas.csv')
+        if pl is not None:
+            # Polars interpreta as colunas de data durante a leitura; converte para pandas só no retorno
+            produtos_df = pl.read_csv('produtos.csv').to_pandas()
+            clientes_df = pl.read_csv('clientes.csv', try_parse_dates=True).to_pandas()
+            vendedores_df = pl.read_csv('vendedores.csv').to_pandas()
+            vendas_df = pl.read_csv('vendas.csv', try_parse_dates=True).to_pandas()
+        else:
+            produtos_df = pd.read_csv('produtos.csv')
+            clientes_df = pd.read_csv('clientes.csv')
+            vendedores_df = pd.read_csv('vendedores.csv')
+            vendas_df = pd.read_csv('vendas.csv')
+
+            # Converter colunas de data
+            vendas_df['data_venda'] = pd.to_datetime(vendas_df['data_venda'])
+            clientes_df['data_cadastro'] = pd.to_datetime(clientes_df['data_cadastro'])
         # fornecedores_df = pd.read_csv('fornecedores.csv') # Carregar se for usar
 
-        # Converter colunas de data
-        vendas_df['data_venda'] = pd.to_datetime(vendas_df['data_venda'])
-        clientes_df['data_cadastro'] = pd.to_datetime(clientes_df['data_cadastro'])
+        # Nomes como strings PyArrow (UTF-8 contíguo): unique/isin/sort rodam em C, não sobre objetos Python
+        produtos_df['nome_produto'] = produtos_df['nome_produto'].astype('string[pyarrow]')
+        clientes_df['nome_cliente'] = clientes_df['nome_cliente'].astype('string[pyarrow]')
+        vendedores_df['nome_vendedor'] = vendedores_df['nome_vendedor'].astype('string[pyarrow]')
         
         return produtos_df, clientes_df, vendedores_df, vendas_df
     except FileNotFoundError as e:
         st.error(f"Erro ao carregar os arquivos CSV: {e}. Verifique os caminhos e se os arquivos existem.")
         return None, None, None, None
 
+@st.cache_data # Merge e colunas calculadas só são refeitos quando os dados carregados mudam
+def build_merged(produtos_df, clientes_df, vendedores_df, vendas_df):
+    # Merge dos DataFrames para criar uma visão unificada
+    # As tabelas de consulta são indexadas pela chave, e o join (left) usa o índice já construído
+    # validate='many_to_one' garante uma linha por venda (id_venda continua único após os joins)
+    df_merged = (vendas_df
+                 .join(produtos_df.set_index('id_produto'), on='id_produto', validate='many_to_one')
+                 .join(clientes_df.set_index('id_cliente'), on='id_cliente', validate='many_to_one')
+                 .join(vendedores_df.set_index('id_vendedor'), on='id_vendedor', validate='many_to_one'))
+
+    # Colunas Calculadas (Regras de Negócio)
+    df_merged['lucro_venda'] = (df_merged['preco_venda_unitario'] - df_merged['preco_custo']) * df_merged['quantidade_vendida']
+    vt = df_merged['valor_total_venda'].to_numpy()
+    lv = df_merged['lucro_venda'].to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'): # Divisões por zero são descartadas pelo np.where
+        df_merged['margem_lucro_percentual'] = np.where(vt != 0, lv / vt * 100.0, 0.0).astype(np.float32) # Margem 0 se valor_total_venda for 0
+    # Chave AAAAMM para agrupamento mensal; Int32 (anulável) mantém como NA as vendas sem data válida
+    df_merged['ano_mes_venda'] = df_merged['data_venda'].dt.year.astype('Int32') * 100 + df_merged['data_venda'].dt.month.astype('Int32')
+    df_merged['ano_venda'] = df_merged['data_venda'].dt.year
+
+    # Colunas de texto com poucos valores distintos viram 'category' (códigos inteiros nos groupby/isin)
+    # Os nomes (alta cardinalidade) ficam como strings PyArrow, definidas em load_data()
+    for col in ['categoria_produto', 'regiao_cliente', 'estado_cliente', 'equipe_vendas', 'metodo_pagamento']:
+        df_merged[col] = df_merged[col].astype('category')
+
+    # Downcast numérico (feito depois das colunas calculadas, que usam a precisão original)
+    # valor_total_venda e lucro_venda continuam float64: em float32 as somas dos KPIs perdem os centavos
+    df_merged[['preco_custo', 'preco_venda_unitario']] = df_merged[['preco_custo', 'preco_venda_unitario']].astype(np.float32)
+    int_cols = ['id_venda', 'id_produto', 'id_cliente', 'id_vendedor', 'quantidade_vendida']
+    df_merged[int_cols] = df_merged[int_cols].astype(np.int32)
+    return df_merged
+
+def aplicar_filtros(df, start_ts, end_ts, filtros_selecao):
+    # Uma única máscara booleana (NumPy) acumulada in-place com &=, sem um array temporário por par de condições
+    datas = df['data_venda'].to_numpy()
+    mask = datas >= start_ts.to_datetime64()
+    mask &= datas < end_ts.to_datetime64()
+    for col, selecionados, todos in filtros_selecao:
+        if len(selecionados) < len(todos): # Seleção completa ("Todos"/"Todas") não restringe nada; pula o isin
+            mask &= df[col].isin(selecionados).to_numpy()
+    return df[mask]
+
+@st.cache_data # Uma agregação por dimensão, reaproveitada pelos gráficos (Top N, distribuição)
+def agg_by(df, col):
+    return df.groupby(col, observed=True).agg(
+        valor_total_venda=('valor_total_venda', 'sum'),
+        quantidade_vendida=('quantidade_vendida', 'sum'),
+        lucro_venda=('lucro_venda', 'sum')
+    )
+
+@st.cache_data # Tabela de detalhes por produto; depende só dos filtros, não das colunas escolhidas para exibição
+def product_detail(df_filtered):
+    # Agrupar para evitar repetição excessiva de produtos se não houver filtros muito específicos
+    # Poderia ser mais detalhado se necessário (ex: por transação)
+    df_produtos_detalhes = df_filtered.groupby(['id_produto', 'nome_produto', 'categoria_produto', 'preco_venda_unitario', 'preco_custo'], observed=True).agg(
+        quantidade_total_vendida=('quantidade_vendida', 'sum'),
+        valor_total_arrecadado=('valor_total_venda', 'sum'),
+        lucro_total_gerado=('lucro_venda', 'sum')
+    ).reset_index()
+    df_produtos_detalhes['margem_lucro_media_percentual'] = (df_produtos_detalhes['lucro_total_gerado'] / df_produtos_detalhes['valor_total_arrecadado']) * 100
+    df_produtos_detalhes['margem_lucro_media_percentual'] = df_produtos_detalhes['margem_lucro_media_percentual'].fillna(0)
+    return df_produtos_detalhes
+
+@st.cache_data # Opções dos filtros da sidebar; só mudam quando df_merged muda
+def sidebar_options(df):
+    return {col: sorted(df[col].dropna().unique().tolist())
+            for col in ['nome_produto', 'categoria_produto', 'nome_cliente', 'regiao_cliente', 'nome_vendedor']}
+
 produtos_df, clientes_df, vendedores_df, vendas_df = load_data()
 
 if produtos_df is None:
     st.stop() # Interrompe a execução se os dados não puderem ser carregados
 
 # Transformação e Regras de Negócio
-# Merge dos DataFrames para criar uma visão unificada
 if vendas_df is not None and produtos_df is not None and clientes_df is not None and vendedores_df is not None:
-    df_merged = pd.merge(vendas_df, produtos_df, on='id_produto', how='left')
-    df_merged = pd.merge(df_merged, clientes_df, on='id_cliente', how='left')
-    df_merged = pd.merge(df_merged, vendedores_df, on='id_vendedor', how='left')
-
-    # Colunas Calculadas (Regras de Negócio)
-    df_merged['lucro_venda'] = (df_merged['preco_venda_unitario'] - df_merged['preco_custo']) * df_merged['quantidade_vendida']
-    df_merged['margem_lucro_percentual'] = (df_merged['lucro_venda'] / df_merged['valor_total_venda']) * 100
-    df_merged['margem_lucro_percentual'] = df_merged['margem_lucro_percentual'].fillna(0) # Tratar NaNs se valor_total_venda for 0
-    df_merged['ano_mes_venda'] = df_merged['data_venda'].dt.to_period('M').astype(str) # Para agrupamento mensal
-    df_merged['ano_venda'] = df_merged['data_venda'].dt.year
+    df_merged = build_merged(produtos_df, clientes_df, vendedores_df, vendas_df)
 else:
     st.warning("Não foi possível realizar o merge dos dataframes. Verifique os arquivos de entrada.")
     df_merged = pd.DataFrame() # Cria um DF vazio para evitar erros subsequentes
@@ -95,44 +171,48 @@ if not df_merged.empty:
         start_date = end_date = datetime.now().date()
         st.sidebar.warning("Não há dados de vendas suficientes para definir um período.")
 
+    opcoes_filtros = sidebar_options(df_merged)
+
     # Filtro de Produto (Nome ou Categoria)
-    all_products = sorted(df_merged['nome_produto'].unique().tolist())
+    all_products = opcoes_filtros['nome_produto']
     selected_products = st.sidebar.multiselect("Produtos", options=['Todos'] + all_products, default=['Todos'])
     if 'Todos' in selected_products:
         selected_products = all_products
 
-    all_categories = sorted(df_merged['categoria_produto'].unique().tolist())
+    all_categories = opcoes_filtros['categoria_produto']
     selected_categories = st.sidebar.multiselect("Categorias de Produto", options=['Todas'] + all_categories, default=['Todas'])
     if 'Todas' in selected_categories:
         selected_categories = all_categories
 
     # Filtro de Cliente (Nome ou Região)
-    all_clients = sorted(df_merged['nome_cliente'].unique().tolist())
+    all_clients = opcoes_filtros['nome_cliente']
     selected_clients = st.sidebar.multiselect("Clientes", options=['Todos'] + all_clients, default=['Todos'])
     if 'Todos' in selected_clients:
         selected_clients = all_clients
 
-    all_client_regions = sorted(df_merged['regiao_cliente'].unique().tolist())
+    all_client_regions = opcoes_filtros['regiao_cliente']
     selected_client_regions = st.sidebar.multiselect("Regiões do Cliente", options=['Todas'] + all_client_regions, default=['Todas'])
     if 'Todas' in selected_client_regions:
         selected_client_regions = all_client_regions
 
     # Filtro de Vendedor
-    all_sellers = sorted(df_merged['nome_vendedor'].unique().tolist())
+    all_sellers = opcoes_filtros['nome_vendedor']
     selected_sellers = st.sidebar.multiselect("Vendedores", options=['Todos'] + all_sellers, default=['Todos'])
     if 'Todos' in selected_sellers:
         selected_sellers = all_sellers
 
     # Aplicar filtros ao DataFrame
-    df_filtered = df_merged[
-        (df_merged['data_venda'].dt.date >= start_date) &
-        (df_merged['data_venda'].dt.date <= end_date) &
-        (df_merged['nome_produto'].isin(selected_products)) &
-        (df_merged['categoria_produto'].isin(selected_categories)) &
-        (df_merged['nome_cliente'].isin(selected_clients)) &
-        (df_merged['regiao_cliente'].isin(selected_client_regions)) &
-        (df_merged['nome_vendedor'].isin(selected_sellers))
+    # Limites do período como Timestamp (fim exclusivo no dia seguinte) para comparar direto com a coluna datetime64
+    start_ts = pd.Timestamp(start_date)
+    end_ts = pd.Timestamp(end_date) + pd.Timedelta(days=1)
+    filtros_selecao = [
+        ('nome_produto', selected_products, all_products),
+        ('categoria_produto', selected_categories, all_categories),
+        ('nome_cliente', selected_clients, all_clients),
+        ('regiao_cliente', selected_client_regions, all_client_regions),
+        ('nome_vendedor', selected_sellers, all_sellers),
     ]
+    df_filtered = aplicar_filtros(df_merged, start_ts, end_ts, filtros_selecao)
 else:
     st.sidebar.warning("DataFrame vazio, filtros não podem ser aplicados.")
     df_filtered = df_merged # Mantém o DF vazio
@@ -144,9 +224,8 @@ with tab1: # Aba "Visão Geral de Vendas"
     st.header("Visão Geral de Vendas")
     if not df_filtered.empty:
         # KPIs
-        total_vendas_valor = df_filtered['valor_total_venda'].sum()
-        total_lucro_valor = df_filtered['lucro_venda'].sum()
-        num_transacoes = df_filtered['id_venda'].nunique()
+        total_vendas_valor, total_lucro_valor = df_filtered[['valor_total_venda', 'lucro_venda']].sum() # Uma única redução sobre as duas colunas
+        num_transacoes = len(df_filtered) # Uma linha por venda (id_venda é chave primária)
         ticket_medio = total_vendas_valor / num_transacoes if num_transacoes > 0 else 0
 
         col1, col2, col3, col4 = st.columns(4)
@@ -157,11 +236,16 @@ with tab1: # Aba "Visão Geral de Vendas"
 
         st.markdown("---    ")
         # Gráfico de Linha: Evolução das Vendas e Lucro ao longo do tempo
-        df_evolucao = df_filtered.groupby('ano_mes_venda')[['valor_total_venda', 'lucro_venda']].sum().reset_index()
-        df_evolucao = df_evolucao.sort_values(by='ano_mes_venda')
-        fig_evolucao = px.line(df_evolucao, x='ano_mes_venda', y=['valor_total_venda', 'lucro_venda'],
+        # Groupby na chave inteira AAAAMM: só restam poucas linhas (uma por mês) para ordenar; vendas sem data (NA) ficam de fora
+        df_evolucao = df_filtered.groupby('ano_mes_venda')[['valor_total_venda', 'lucro_venda']].sum()
+        # Meses sem vendas no intervalo entram com 0, para a linha não ligar meses distantes
+        meses = pd.period_range(pd.Period(year=df_evolucao.index.min() // 100, month=df_evolucao.index.min() % 100, freq='M'),
+                                pd.Period(year=df_evolucao.index.max() // 100, month=df_evolucao.index.max() % 100, freq='M'), freq='M')
+        df_evolucao = df_evolucao.reindex(meses.year * 100 + meses.month, fill_value=0)
+        df_evolucao['mes_label'] = meses.strftime('%Y-%m') # Rótulo 'AAAA-MM' só para o eixo do gráfico
+        fig_evolucao = px.line(df_evolucao, x='mes_label', y=['valor_total_venda', 'lucro_venda'],
                                title="Evolução Mensal de Vendas e Lucro", markers=True,
-                               labels={'value': 'Valor (R$)', 'variable': 'Métrica', 'ano_mes_venda': 'Mês'})
+                               labels={'value': 'Valor (R$)', 'variable': 'Métrica', 'mes_label': 'Mês'})
         fig_evolucao.update_layout(yaxis_title="Valor (R$)")
         st.plotly_chart(fig_evolucao, use_container_width=True)
 
@@ -169,7 +253,7 @@ with tab1: # Aba "Visão Geral de Vendas"
         with col_vis1:
             # Gráfico de Barras: Top N Vendedores por valor de venda
             top_n_vendedores = st.number_input("Número de Top Vendedores para exibir:", min_value=3, max_value=20, value=5, key='top_vendedores_geral')
-            df_top_vendedores = df_filtered.groupby('nome_vendedor')['valor_total_venda'].sum().nlargest(top_n_vendedores).reset_index()
+            df_top_vendedores = agg_by(df_filtered, 'nome_vendedor')['valor_total_venda'].nlargest(top_n_vendedores).reset_index()
             fig_top_vendedores = px.bar(df_top_vendedores, x='nome_vendedor', y='valor_total_venda',
                                         title=f"Top {top_n_vendedores} Vendedores por Valor de Venda",
                                         labels={'nome_vendedor': 'Vendedor', 'valor_total_venda': 'Total Vendas (R$)'},
@@ -178,7 +262,7 @@ with tab1: # Aba "Visão Geral de Vendas"
 
         with col_vis2:
             # Gráfico de Pizza/Barras: Distribuição de Vendas por Região do Cliente
-            df_vendas_regiao = df_filtered.groupby('regiao_cliente')['valor_total_venda'].sum().reset_index()
+            df_vendas_regiao = agg_by(df_filtered, 'regiao_cliente')['valor_total_venda'].reset_index()
             fig_vendas_regiao = px.pie(df_vendas_regiao, values='valor_total_venda', names='regiao_cliente',
                                        title="Distribuição de Vendas por Região do Cliente",
                                        hole=.3)
@@ -197,11 +281,11 @@ with tab2: # Aba "Análise de Produtos e Clientes"
             top_n_produtos = st.number_input("Número de Top Produtos para exibir:", min_value=3, max_value=20, value=5, key='top_produtos_analise')
             
             if tipo_analise_produto == 'Valor de Venda':
-                df_top_produtos = df_filtered.groupby('nome_produto')['valor_total_venda'].sum().nlargest(top_n_produtos).reset_index()
+                df_top_produtos = agg_by(df_filtered, 'nome_produto')['valor_total_venda'].nlargest(top_n_produtos).reset_index()
                 y_axis_prod = 'valor_total_venda'
                 y_label_prod = 'Total Vendas (R$)'
             else:
-                df_top_produtos = df_filtered.groupby('nome_produto')['quantidade_vendida'].sum().nlargest(top_n_produtos).reset_index()
+                df_top_produtos = agg_by(df_filtered, 'nome_produto')['quantidade_vendida'].nlargest(top_n_produtos).reset_index()
                 y_axis_prod = 'quantidade_vendida'
                 y_label_prod = 'Quantidade Vendida'
 
@@ -214,7 +298,7 @@ with tab2: # Aba "Análise de Produtos e Clientes"
         with col_prod2:
             # Gráfico de Barras: Clientes que mais compraram (por valor)
             top_n_clientes = st.number_input("Número de Top Clientes para exibir:", min_value=3, max_value=20, value=5, key='top_clientes_analise')
-            df_top_clientes = df_filtered.groupby('nome_cliente')['valor_total_venda'].sum().nlargest(top_n_clientes).reset_index()
+            df_top_clientes = agg_by(df_filtered, 'nome_cliente')['valor_total_venda'].nlargest(top_n_clientes).reset_index()
             fig_top_clientes = px.bar(df_top_clientes, x='nome_cliente', y='valor_total_venda',
                                       title=f"Top {top_n_clientes} Clientes por Valor de Compra",
                                       labels={'nome_cliente': 'Cliente', 'valor_total_venda': 'Total Comprado (R$)'},
@@ -232,15 +316,8 @@ with tab2: # Aba "Análise de Produtos e Clientes"
                                                    default=['nome_produto', 'categoria_produto', 'quantidade_vendida', 'valor_total_venda', 'lucro_venda'])
         
         if selected_cols_tabela_prod:
-            # Agrupar para evitar repetição excessiva de produtos se não houver filtros muito específicos
-            # Poderia ser mais detalhado se necessário (ex: por transação)
-            df_produtos_detalhes = df_filtered.groupby(['id_produto', 'nome_produto', 'categoria_produto', 'preco_venda_unitario', 'preco_custo']).agg(
-                quantidade_total_vendida=('quantidade_vendida', 'sum'),
-                valor_total_arrecadado=('valor_total_venda', 'sum'),
-                lucro_total_gerado=('lucro_venda', 'sum')
-            ).reset_index()
-            df_produtos_detalhes['margem_lucro_media_percentual'] = (df_produtos_detalhes['lucro_total_gerado'] / df_produtos_detalhes['valor_total_arrecadado']) * 100
-            df_produtos_detalhes['margem_lucro_media_percentual'] = df_produtos_detalhes['margem_lucro_media_percentual'].fillna(0)
+            # Agregação em cache: trocar só as colunas exibidas não refaz o groupby
+            df_produtos_detalhes = product_detail(df_filtered)
             
             # Renomear colunas para a exibição e selecionar as colunas corretas
             display_cols_map = {
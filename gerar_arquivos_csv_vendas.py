@@ -10,9 +10,10 @@ Arquivos gerados:
 '''
 import pandas as pd
 from faker import Faker
-import random
 from datetime import datetime, timedelta
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 
 # Inicializar o Faker
 fake = Faker('pt_BR')
@@ -23,107 +24,100 @@ NUM_PRODUTOS = 50
 NUM_CLIENTES = 200
 NUM_VENDEDORES = 20
 NUM_VENDAS = 1000
+SEED = 42 # Semente única de Faker e NumPy
+DATA_REFERENCIA = datetime(2025, 6, 1) # 'Hoje' fixo das datas geradas; com a semente, cada execução gera os mesmos dados
+
+# Semente do Faker e gerador NumPy para as colunas numéricas e escolhas aleatórias
+Faker.seed(SEED)
+rng = np.random.default_rng(SEED)
 
 # Geração de Fornecedores
-fornecedores_data = []
-for i in range(1, NUM_FORNECEDORES + 1):
-    fornecedores_data.append({
-        'id_fornecedor': i,
-        'nome_fornecedor': fake.company(),
-        'contato_fornecedor': fake.name(),
-        'email_fornecedor': fake.email(),
-        'telefone_fornecedor': fake.phone_number()
-    })
-fornecedores_df = pd.DataFrame(fornecedores_data)
+fornecedores_df = pd.DataFrame({
+    'id_fornecedor': np.arange(1, NUM_FORNECEDORES + 1),
+    'nome_fornecedor': [fake.company() for _ in range(NUM_FORNECEDORES)],
+    'contato_fornecedor': [fake.name() for _ in range(NUM_FORNECEDORES)],
+    'email_fornecedor': [fake.email() for _ in range(NUM_FORNECEDORES)],
+    'telefone_fornecedor': [fake.phone_number() for _ in range(NUM_FORNECEDORES)]
+})
 
 # Geração de Produtos
-produtos_data = []
 categorias_produto = ['Eletrônicos', 'Livros', 'Roupas', 'Alimentos', 'Móveis', 'Brinquedos', 'Esportes']
-fornecedor_ids = fornecedores_df['id_fornecedor'].tolist()
-
-for i in range(1, NUM_PRODUTOS + 1):
-    custo = round(random.uniform(5.0, 500.0), 2)
-    preco_venda = round(custo * random.uniform(1.2, 2.5), 2) # Margem de lucro entre 20% e 150%
-    produtos_data.append({
-        'id_produto': i,
-        'nome_produto': f'{fake.word().capitalize()} {fake.word().capitalize()}', # Nome de produto mais genérico
-        'categoria_produto': random.choice(categorias_produto),
-        'preco_custo': custo,
-        'preco_venda_unitario': preco_venda,
-        'id_fornecedor': random.choice(fornecedor_ids)
-    })
-produtos_df = pd.DataFrame(produtos_data)
+fornecedor_ids = fornecedores_df['id_fornecedor'].to_numpy()
+
+custos = np.round(rng.uniform(5.0, 500.0, NUM_PRODUTOS), 2)
+precos_venda = np.round(custos * rng.uniform(1.2, 2.5, NUM_PRODUTOS), 2) # Margem de lucro entre 20% e 150%
+produtos_df = pd.DataFrame({
+    'id_produto': np.arange(1, NUM_PRODUTOS + 1),
+    'nome_produto': [f'{fake.word().capitalize()} {fake.word().capitalize()}' for _ in range(NUM_PRODUTOS)], # Nome de produto mais genérico
+    'categoria_produto': rng.choice(categorias_produto, NUM_PRODUTOS),
+    'preco_custo': custos,
+    'preco_venda_unitario': precos_venda,
+    'id_fornecedor': rng.choice(fornecedor_ids, NUM_PRODUTOS)
+})
 
 # Geração de Clientes
-clientes_data = []
 regioes_cliente = ['Norte', 'Nordeste', 'Centro-Oeste', 'Sudeste', 'Sul']
-for i in range(1, NUM_CLIENTES + 1):
-    clientes_data.append({
-        'id_cliente': i,
-        'nome_cliente': fake.name(),
-        'email_cliente': fake.unique.email(),
-        'telefone_cliente': fake.phone_number(),
-        'endereco_cliente': fake.street_address(),
-        'cidade_cliente': fake.city(),
-        'estado_cliente': fake.state_abbr(),
-        'pais_cliente': 'Brasil',
-        'regiao_cliente': random.choice(regioes_cliente),
-        'data_cadastro': fake.date_between(start_date='-3y', end_date='today')
-    })
-clientes_df = pd.DataFrame(clientes_data)
+clientes_df = pd.DataFrame({
+    'id_cliente': np.arange(1, NUM_CLIENTES + 1),
+    'nome_cliente': [fake.name() for _ in range(NUM_CLIENTES)],
+    'email_cliente': [f'{fake.user_name()}.{i}@{fake.safe_domain_name()}' for i in range(1, NUM_CLIENTES + 1)], # Sufixo com o id garante unicidade sem fake.unique
+    'telefone_cliente': [fake.phone_number() for _ in range(NUM_CLIENTES)],
+    'endereco_cliente': [fake.street_address() for _ in range(NUM_CLIENTES)],
+    'cidade_cliente': [fake.city() for _ in range(NUM_CLIENTES)],
+    'estado_cliente': [fake.state_abbr() for _ in range(NUM_CLIENTES)],
+    'pais_cliente': 'Brasil',
+    'regiao_cliente': rng.choice(regioes_cliente, NUM_CLIENTES),
+    'data_cadastro': [fake.date_between(start_date=DATA_REFERENCIA.date() - timedelta(days=3 * 365), end_date=DATA_REFERENCIA.date()) for _ in range(NUM_CLIENTES)]
+})
 
 # Geração de Vendedores
-vendedores_data = []
 equipes_vendas = ['Equipe Alpha', 'Equipe Beta', 'Equipe Gamma', 'Equipe Delta']
-for i in range(1, NUM_VENDEDORES + 1):
-    vendedores_data.append({
-        'id_vendedor': i,
-        'nome_vendedor': fake.name(),
-        'email_vendedor': fake.unique.email(),
-        'matricula_vendedor': f'V{fake.unique.random_number(digits=5)}',
-        'equipe_vendas': random.choice(equipes_vendas)
-    })
-vendedores_df = pd.DataFrame(vendedores_data)
+vendedores_df = pd.DataFrame({
+    'id_vendedor': np.arange(1, NUM_VENDEDORES + 1),
+    'nome_vendedor': [fake.name() for _ in range(NUM_VENDEDORES)],
+    'email_vendedor': [f'{fake.user_name()}.{i}@{fake.safe_domain_name()}' for i in range(1, NUM_VENDEDORES + 1)],
+    'matricula_vendedor': [f'V{fake.unique.random_number(digits=5)}' for _ in range(NUM_VENDEDORES)],
+    'equipe_vendas': rng.choice(equipes_vendas, NUM_VENDEDORES)
+})
 
 # Geração de Vendas
-vendas_data = []
-produto_ids = produtos_df['id_produto'].tolist()
-cliente_ids = clientes_df['id_cliente'].tolist()
-vendedor_ids = vendedores_df['id_vendedor'].tolist()
+produto_ids = produtos_df['id_produto'].to_numpy()
+cliente_ids = clientes_df['id_cliente'].to_numpy()
+vendedor_ids = vendedores_df['id_vendedor'].to_numpy()
 metodos_pagamento = ['Cartão de Crédito', 'Boleto Bancário', 'PIX', 'Débito Online', 'Transferência Bancária']
 
-# Criar um dicionário para consulta rápida de preços dos produtos
-precos_produtos = produtos_df.set_index('id_produto')['preco_venda_unitario'].to_dict()
-
-for i in range(1, NUM_VENDAS + 1):
-    id_prod = random.choice(produto_ids)
-    quantidade = random.randint(1, 10)
-    preco_unitario_prod = precos_produtos[id_prod]
-    valor_total = round(preco_unitario_prod * quantidade, 2)
-    
-    # Simular datas de venda nos últimos 2 anos
-    data_venda = fake.date_time_between(start_date='-2y', end_date='now', tzinfo=None)
-    
-    vendas_data.append({
-        'id_venda': i,
-        'id_produto': id_prod,
-        'id_cliente': random.choice(cliente_ids),
-        'id_vendedor': random.choice(vendedor_ids),
-        'data_venda': data_venda,
-        'quantidade_vendida': quantidade,
-        'valor_total_venda': valor_total,
-        'metodo_pagamento': random.choice(metodos_pagamento)
-    })
-vendas_df = pd.DataFrame(vendas_data)
+# Array de preços indexado pela posição do produto (id_produto - 1) para consulta vetorizada
+precos_produtos = produtos_df['preco_venda_unitario'].to_numpy()
+
+id_prod_idx = rng.integers(0, len(produto_ids), NUM_VENDAS)
+quantidades = rng.integers(1, 11, NUM_VENDAS)
+
+vendas_df = pd.DataFrame({
+    'id_venda': np.arange(1, NUM_VENDAS + 1),
+    'id_produto': produto_ids[id_prod_idx],
+    'id_cliente': rng.choice(cliente_ids, NUM_VENDAS),
+    'id_vendedor': rng.choice(vendedor_ids, NUM_VENDAS),
+    # Simular datas de venda nos 2 anos anteriores à data de referência (deslocamentos em segundos)
+    'data_venda': np.datetime64(DATA_REFERENCIA, 's') - rng.integers(0, 2 * 365 * 86400, NUM_VENDAS).astype('timedelta64[s]'),
+    'quantidade_vendida': quantidades,
+    'valor_total_venda': np.round(precos_produtos[id_prod_idx] * quantidades, 2),
+    'metodo_pagamento': rng.choice(metodos_pagamento, NUM_VENDAS)
+})
 
 # Salvar DataFrames em arquivos CSV
 output_path = '.' # Salvar no diretório atual
 
-fornecedores_df.to_csv(output_path + '/fornecedores.csv', index=False, encoding='utf-8-sig')
-produtos_df.to_csv(output_path + '/produtos.csv', index=False, encoding='utf-8-sig')
-clientes_df.to_csv(output_path + '/clientes.csv', index=False, encoding='utf-8-sig')
-vendedores_df.to_csv(output_path + '/vendedores.csv', index=False, encoding='utf-8-sig')
-vendas_df.to_csv(output_path + '/vendas.csv', index=False, encoding='utf-8-sig')
+def salvar_csv(df, caminho):
+    # Escrita com o writer C++ do PyArrow; o BOM mantém a compatibilidade com o Excel (antigo utf-8-sig)
+    with open(caminho, 'wb') as arquivo:
+        arquivo.write('\ufeff'.encode('utf-8'))
+        pa_csv.write_csv(pa.Table.from_pandas(df, preserve_index=False), arquivo)
+
+salvar_csv(fornecedores_df, output_path + '/fornecedores.csv')
+salvar_csv(produtos_df, output_path + '/produtos.csv')
+salvar_csv(clientes_df, output_path + '/clientes.csv')
+salvar_csv(vendedores_df, output_path + '/vendedores.csv')
+salvar_csv(vendas_df, output_path + '/vendas.csv')
 
 print(f"Arquivos CSV gerados com sucesso em: {output_path if output_path != '.' else 'diretório atual'}")
 print(f" - {len(fornecedores_df)} fornecedores em fornecedores.csv")